@@ -1,10 +1,13 @@
 import collections.abc
+import functools
 
 import nativedb.field
 import nativedb.generics
 
 
 class DbModel:
+    __slots__ = ()
+
     def __new__(cls, *args, **kwargs):
         if '___internal___' in kwargs:
             kwargs.pop('___internal___')
@@ -27,16 +30,26 @@ class DbModel:
         return nativedb.field.Field(fieldname, anno, key, unique, notnull)
 
     @classmethod
-    def _get_default(cls, fieldname: str):
-        default = cls.__dict__.get(fieldname)
+    def _get_class_default(cls, fieldname: str):
+        return cls.__dict__.get(fieldname)
+
+    @classmethod
+    def _get_default_factory(cls, fieldname: str) -> collections.abc.Callable:
+        """Get a callable taking no args that returns a new default value for the field each time it is called, so
+        the class default only needs to be inspected once per field"""
+        default = cls._get_class_default(fieldname)
         if isinstance(default, collections.abc.Callable):
-            return default()
+            return default
         if isinstance(default, collections.abc.Iterator):
-            return next(default)
+            return functools.partial(next, default)
         t = cls._get_field(fieldname).type
         if t in {list, set, dict, tuple}:
-            return t()
-        return default
+            return t
+        return lambda: default
+
+    @classmethod
+    def _get_default(cls, fieldname: str):
+        return cls._get_default_factory(fieldname)()
 
     @classmethod
     def find(cls, *args, **kwargs):
@@ -76,7 +89,7 @@ class DbModel:
         :return:
         """
         update_vals = {
-            k: v for k, v in self.__dict__.items() if k in self.__annotations__
+            k: getattr(self, k) for k in self.__annotations__
         }
         update_vals.update(kwargs)
         return self.update(**update_vals)
@@ -3,7 +3,7 @@ import nativedb.mongodb
 
 def database(database_or_name):
     def decorator(cls):
-        if hasattr(cls, '__mro__') and nativedb.mongodb.MongoDbModel in cls.__mro__:
+        if isinstance(cls, type) and issubclass(cls, nativedb.mongodb.MongoDbModel):
             cls.set_database(database_or_name)
         return cls
 
@@ -12,7 +12,7 @@ def database(database_or_name):
 
 def collection(collection_or_name):
     def decorator(cls):
-        if hasattr(cls, '__mro__') and nativedb.mongodb.MongoDbModel in cls.__mro__:
+        if isinstance(cls, type) and issubclass(cls, nativedb.mongodb.MongoDbModel):
             cls.set_collection(collection_or_name)
         return cls
 
@@ -3,7 +3,17 @@ class DatabaseError(Exception):
 
 
 class UniqueConflict(DatabaseError, ValueError):
-    pass
+    def __init__(self, *args, inserted: list = None):
+        super().__init__(*args)
+        # instances whose documents were written before a bulk write failed with this conflict
+        self.inserted = [] if inserted is None else inserted
+
+
+class BulkWriteFailed(DatabaseError):
+    def __init__(self, *args, inserted: list = None):
+        super().__init__(*args)
+        # instances whose documents were written before the bulk write failed
+        self.inserted = [] if inserted is None else inserted
 
 
 class NoDatabase(DatabaseError, ValueError):
@@ -4,13 +4,15 @@ import weakref
 from typing import Self, Optional
 
 import bson
+import pymongo.collection
 import pymongo.database
 import pymongo.errors
+import pymongo.operations
 
 import nativeserializer
 
 from .dbmodel import DbModel
-from .exceptions import MultipleKeys, NoCollection, NoDatabase, UniqueConflict
+from .exceptions import BulkWriteFailed, MultipleKeys, NoCollection, NoDatabase, UniqueConflict
 from .generics import Key
 
 
@@ -79,61 +81,206 @@ def set_default_database(database: [str, pymongo.database.Database] = None):
         MongoDbModel._DEFAULT_DATABASE = database
 
 
-class MongoDbModel(DbModel):
+def _write_errors(e: pymongo.errors.BulkWriteError) -> list[dict]:
+    return e.details.get('writeErrors', [])
+
+
+def _raise_bulk_write_error(e: pymongo.errors.BulkWriteError, inserted: list = None):
+    """Re-raise a BulkWriteError as UniqueConflict if any of its write errors is a duplicate key error, or as
+    BulkWriteFailed otherwise, with the instances that were written before the failure as their inserted attribute"""
+    if any(error.get('code') == 11000 for error in _write_errors(e)):
+        raise UniqueConflict(inserted=inserted) from e
+    raise BulkWriteFailed(str(e), inserted=inserted) from e
+
+
+def _check_batch_size(batch_size: int):
+    if batch_size < 1:
+        raise ValueError(f'batch_size must be at least 1, not {batch_size}')
+
+
+def _compile_retrieve_vals(
+        anno_items: tuple[tuple[str, type], ...],
+        deserialize: collections.abc.Callable,
+        missing_factories: dict[str, collections.abc.Callable],
+):
+    """Generate a model's _get_retrieve_vals function, which converts a document fetched from the database into the
+    kwargs for an internal __init__ call.  It is specialized for the model's fields, so each field is deserialized
+    with its annotation bound as a constant rather than looked up per document.  '_id' is copied through unchanged,
+    and any other keys not in anno_items are dropped, as instances have no slot to hold them.  Fields missing from
+    the document are filled by calling their factory in missing_factories, so the result always holds every field.
+
+    :param anno_items: (field name, annotation) pairs of the model
+    :param deserialize: bound deserialize method of the model's serializer
+    :param missing_factories: callables taking no args giving the value of each field when it is missing
+    :return: function taking a dict of database-storable values and returning a dict of raw values
+    """
+    namespace = {'_deserialize': deserialize}
+    lines = ['def _retrieve_vals(d):', "    rv = {'_id': d['_id']}"]
+    for i, (k, anno) in enumerate(anno_items):
+        namespace[f'_anno_{i}'] = anno
+        lines.append(f'    if {k!r} in d:')
+        lines.append(f'        rv[{k!r}] = _deserialize(_anno_{i}, d[{k!r}])')
+        namespace[f'_missing_{i}'] = missing_factories[k]
+        lines.append('    else:')
+        lines.append(f'        rv[{k!r}] = _missing_{i}()')
+    lines.append('    return rv')
+    exec('\n'.join(lines), namespace)
+    return namespace['_retrieve_vals']
+
+
+class _LazySignature:
+    """Descriptor providing the signature of a MongoDbModel subclass, built from its annotations the first time it
+    is requested (e.g. by inspect.signature) and then cached on the subclass"""
+
+    def __get__(self, instance, owner):
+        if owner is MongoDbModel:
+            return None
+        if '_SIGNATURE' not in owner.__dict__:
+            owner._SIGNATURE = inspect.Signature(
+                parameters=[
+                    inspect.Parameter(k, inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=v)
+                    for k, v in owner._ANNO_ITEMS
+                ],
+                return_annotation=None,
+            )
+        return owner._SIGNATURE
+
+
+class _MongoDbModelMeta(type):
+    """Metaclass giving each MongoDbModel subclass __slots__ for its fields, so instances hold field values in fixed
+    slots rather than a per-instance __dict__.  As a result, instances can't be given attributes other than their
+    fields (unless the model declares extra __slots__ for them), and defaults assigned to fields in the class body
+    would clash with the slots of the same name, so they are moved into _FIELD_DEFAULTS instead (accessing
+    Model.field gives the slot descriptor, not the default)."""
+
+    def __new__(mcs, name, bases, namespace, **kwargs):
+        # MongoDbModel itself declares its own slots, and its annotations are class attributes rather than fields
+        if any(isinstance(base, mcs) for base in bases):
+            annotations = namespace.get('__annotations__', {})
+            namespace['_FIELD_DEFAULTS'] = {k: namespace.pop(k) for k in annotations if k in namespace}
+            # keep any slots the model declares itself, adding the fields it doesn't already have
+            slots = namespace.get('__slots__', ())
+            slots = (slots,) if isinstance(slots, str) else tuple(slots)
+            namespace['__slots__'] = slots + tuple(k for k in annotations if k not in slots)
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+
+class MongoDbModel(DbModel, metaclass=_MongoDbModelMeta):
+    __slots__ = ('_id', '_id_filter', '_pending_updates', '__weakref__')
+
     # MongoDbModel class attribute
     _DEFAULT_CLIENT: pymongo.mongo_client.MongoClient = pymongo.MongoClient()
     _DEFAULT_DATABASE: pymongo.database.Database = None
-    _SERIALIZER: nativeserializer.Serializer = nativeserializer.Serializer()
+    _SERIALIZER: nativeserializer.Serializer = nativeserializer.Serializer(passthrough_types=(bson.ObjectId,))
 
     # Subclass attributes (set in __init_subclass__)
     _CLIENT: pymongo.mongo_client.MongoClient
     _DATABASE: pymongo.database.Database
     _COLLECTION: pymongo.collection.Collection
     _COLLECTION_INITIALIZED: bool
-    _WEAKREFS: dict[bson.ObjectId, weakref.ref]
+    _COLLECTION_FROM_DATABASE: bool
+    _COLLECTION_NAME: Optional[str]
+    _WEAKREFS: weakref.WeakValueDictionary[bson.ObjectId, Self]
+    _ANNO_KEYS: tuple[str, ...]
+    _ANNO_ITEMS: tuple[tuple[str, type], ...]
+    _ANNO_SET: frozenset[str]
+    _get_retrieve_vals: collections.abc.Callable[[dict], dict]
+    _SERIALIZE: collections.abc.Callable
+    _DESERIALIZE: collections.abc.Callable
+    _FIELD_DEFAULTS: dict[str, object] = {}
+    _PROJECTION: dict[str, int]
+    _DEFAULT_FACTORIES: dict[str, collections.abc.Callable]
+    _UNIQUE_FIELDS: tuple[str, ...]
+    _STATEFUL_DEFAULTS: frozenset[str]
+    _BATCH_SIZE: int = 1000
     _KEY_FIELD: str = '_id'
+    _SIGNATURE: inspect.Signature
+    __signature__ = _LazySignature()
 
     # Instance attributes (set in __init__)
     _id: bson.ObjectId
+    _id_filter: dict[str, bson.ObjectId]
+    _pending_updates: Optional[dict[str, object]]
 
-    def __init__(self, *args, **kwargs):
-        # initialize with default values where specified, None otherwise
-        for key in self.__annotations__:
-            self.__dict__[key] = self.__class__.__dict__.get(key)
-
-        values = {k: v for k, v in zip(self.__annotations__, args)}
-        values.update(kwargs)
-        self.__dict__.update(values)
-        self.__class__._WEAKREFS[self._id] = weakref.ref(self)
+    def __init__(self, *args, ___internal___=False, **kwargs):
+        if not ___internal___:
+            # DbModel.__new__ has already built this instance through new, which ends in an internal __init__ call
+            # with every field set, so re-applying the user's args here would only reset fields to class defaults
+            return
+        cls = self.__class__
+        # internal callers (new, bulk_new, _get) pass _id and a value for every field, so kwargs can be written
+        # straight into the slots.  object.__setattr__ keeps them from being tracked as pending updates
+        set_field = object.__setattr__
+        for k, v in kwargs.items():
+            set_field(self, k, v)
+        # _id never changes once assigned, so the filter matching this document can be built once and reused
+        set_field(self, '_id_filter', {'_id': self._id})
+        # created on the first tracked assignment, so instances that are only read don't each carry an empty dict
+        set_field(self, '_pending_updates', None)
+        cls._WEAKREFS[self._id] = self
+
+    def __setattr__(self, key, value):
+        super().__setattr__(key, value)
+        # track fields assigned directly so bulk_update knows what to write
+        if key in self._ANNO_SET:
+            if (pending_updates := self._pending_updates) is None:
+                pending_updates = {}
+                object.__setattr__(self, '_pending_updates', pending_updates)
+            pending_updates[key] = value
 
     def __init_subclass__(cls, **kwargs):
         cls._SUBCLASS_INITIALIZED = False
-        cls._WEAKREFS = {}
+        # entries are dropped automatically once an instance is garbage collected
+        cls._WEAKREFS = weakref.WeakValueDictionary()
         cls._CLIENT = cls._DEFAULT_CLIENT
         cls._DATABASE = cls._DEFAULT_DATABASE
         # noinspection PyTypeChecker
         cls._COLLECTION = None
         cls._COLLECTION_INITIALIZED = False
+        cls._COLLECTION_FROM_DATABASE = False
+        cls._COLLECTION_NAME = None
         database, collection = kwargs.get('database'), kwargs.get('collection')
         if database:
             cls.set_database(database)
         if collection:
             cls.set_collection(collection)
-        for anno, val in cls.__annotations__.items():
+        # freeze the annotations once so hot paths don't re-iterate the annotations dict on every call
+        cls._ANNO_KEYS = tuple(cls.__annotations__)
+        cls._ANNO_ITEMS = tuple(cls.__annotations__.items())
+        cls._ANNO_SET = frozenset(cls._ANNO_KEYS)
+        # only fetch the fields the model can hold, as any others would be dropped when building instances
+        cls._PROJECTION = {k: 1 for k in cls._ANNO_KEYS}
+        cls._PROJECTION['_id'] = 1
+        cls._DEFAULT_FACTORIES = {k: cls._get_default_factory(k) for k in cls._ANNO_KEYS}
+        cls._UNIQUE_FIELDS = tuple(k for k in cls._ANNO_KEYS if cls._get_field(k).unique_or_key)
+        # fields whose defaults may have side effects or be costly (e.g. a counter), so must only be made on insert
+        cls._STATEFUL_DEFAULTS = frozenset(
+            k for k in cls._ANNO_KEYS
+            if isinstance(cls._get_class_default(k), (collections.abc.Callable, collections.abc.Iterator))
+        )
+        # bind the serializer methods once so hot paths avoid re-resolving them per value
+        cls._SERIALIZE = cls._SERIALIZER.serialize
+        cls._DESERIALIZE = cls._SERIALIZER.deserialize
+        # fields missing from a stored document get their default, except that callable and iterator defaults are
+        # only for new documents (e.g. a counter shouldn't advance on reads), so those fields are None instead
+        missing_factories = {
+            k: (lambda: None) if k in cls._STATEFUL_DEFAULTS else cls._DEFAULT_FACTORIES[k] for k in cls._ANNO_KEYS
+        }
+        cls._get_retrieve_vals = staticmethod(
+            _compile_retrieve_vals(cls._ANNO_ITEMS, cls._DESERIALIZE, missing_factories)
+        )
+        for anno, val in cls._ANNO_ITEMS:
             if hasattr(val, '__origin__') and val.__origin__ is Key:
                 if cls._KEY_FIELD != '_id':
                     raise MultipleKeys(f'Too many Key fields in model "{cls.__name__}". Use Unique'
                                        f' for multiple unique fields.')
                 cls._KEY_FIELD = anno
-        cls.__init__.__signature__ = inspect.Signature(
-            parameters=[inspect.Parameter('self', inspect.Parameter.POSITIONAL_ONLY, annotation=cls)] + [
-                inspect.Parameter(k, inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=v)
-                for k, v in cls.__annotations__.items()
-            ],
-            return_annotation=None,
-        )
         register_type(cls, cls._db_store_, cls._db_retrieve_)
 
+    @classmethod
+    def _get_class_default(cls, fieldname: str):
+        return cls._FIELD_DEFAULTS.get(fieldname)
+
     @classmethod
     def register_type(cls, type_, store_fn, retrive_fn):
         cls._SERIALIZER.register_type(type_, store_fn, retrive_fn)
@@ -142,14 +289,27 @@ class MongoDbModel(DbModel):
     def set_database(cls, database: [str, pymongo.database.Database]):
         if isinstance(database, pymongo.database.Database):
             cls._DATABASE = database
+            cls._reset_collection()
             return
         if isinstance(database, str):
             client = cls._get_client()
             if client:
                 cls._DATABASE = cls._get_client().get_database(database)
+                cls._reset_collection()
                 return
         raise NoDatabase(f'Unable to set database for {cls}')
 
+    @classmethod
+    def _reset_collection(cls):
+        """Make get_collection resolve the collection again after the database changes.  A Collection object given to
+        set_collection is kept as is, but one resolved from the old database (by model name, or by the name given to
+        set_collection) is dropped, to be resolved by the same name in the new database"""
+        if cls._COLLECTION_FROM_DATABASE:
+            # noinspection PyTypeChecker
+            cls._COLLECTION = None
+            cls._COLLECTION_FROM_DATABASE = False
+        cls._COLLECTION_INITIALIZED = False
+
     @classmethod
     def get_database(cls):
         return cls._DATABASE
@@ -166,65 +326,89 @@ class MongoDbModel(DbModel):
     def set_collection(cls, collection: [str, pymongo.collection.Collection]):
         if isinstance(collection, pymongo.collection.Collection):
             cls._COLLECTION = collection
+            cls._COLLECTION_NAME = None
+            cls._COLLECTION_FROM_DATABASE = False
+            cls._COLLECTION_INITIALIZED = False
             return
         elif isinstance(collection, str):
             if (database := cls.get_database()) is not None:
                 cls._COLLECTION = database.get_collection(collection)
+                # keep the name so the collection follows any later change of database
+                cls._COLLECTION_NAME = collection
+                cls._COLLECTION_FROM_DATABASE = True
+                cls._COLLECTION_INITIALIZED = False
                 return
         raise NoDatabase(f'Unable to set collection to {collection} for {cls} as there is no specified database')
 
     @classmethod
     def _init_collection(cls, collection: pymongo.collection.Collection):
-        for k in cls.__annotations__:
-            if cls._get_field(k).unique_or_key:
-                collection.create_index(k, unique=True)
+        if cls._UNIQUE_FIELDS:
+            collection.create_indexes([pymongo.operations.IndexModel(k, unique=True) for k in cls._UNIQUE_FIELDS])
         cls._COLLECTION_INITIALIZED = True
 
     @classmethod
     def get_collection(cls):
-        collection = None
-        if cls._COLLECTION is not None:
-            collection = cls._COLLECTION
-        database = cls.get_database()
-        if database is not None:
-            collection = database.get_collection(cls.__name__)
+        if cls._COLLECTION_INITIALIZED:
+            return cls._COLLECTION
+        collection = cls._COLLECTION
+        if collection is None and (database := cls.get_database()) is not None:
+            collection = database.get_collection(cls._COLLECTION_NAME or cls.__name__)
+            cls._COLLECTION_FROM_DATABASE = True
         if collection is None:
             raise NoCollection(f'{cls} has no specified collection, or database for '
                                f'generic collection')
-        if not cls._COLLECTION_INITIALIZED:
-            cls._init_collection(collection)
+        cls._COLLECTION = collection
+        cls._init_collection(collection)
         return collection
 
     @classmethod
     def _get(cls, doc: dict):
-        bson_id = doc['_id']
-        if bson_id in cls._WEAKREFS:
-            if obj := cls._WEAKREFS[bson_id]():
-                # ensure the object isn't duplicated in memory, and uses any already existing one
-                # this also ensures all references to the same db doc point to the same object
-                return obj
-        doc.update(cls._get_retrieve_vals(doc))
-        return cls(**doc, ___internal___=True)
+        if (obj := cls._WEAKREFS.get(doc['_id'])) is not None:
+            # ensure the object isn't duplicated in memory, and uses any already existing one
+            # this also ensures all references to the same db doc point to the same object
+            return obj
+        # _get_retrieve_vals already returns a new dict, so no need to merge it back into doc
+        return cls(**cls._get_retrieve_vals(doc), ___internal___=True)
 
     @classmethod
     def _get_all_args(cls, *args, **kwargs):
-        all_args = {k: v for k, v in zip(cls.__annotations__, args)}
+        all_args = dict(zip(cls._ANNO_KEYS, args))
         all_args.update(kwargs)
         return all_args
 
+    @classmethod
+    def iter_query(cls, query) -> collections.abc.Iterator[Self]:
+        """Lazily iterate over instances matching a raw MongoDB query.  The underlying pymongo cursor fetches
+        documents from the server in batches of cls._BATCH_SIZE as iteration proceeds, and holds its server-side
+        cursor open until it is exhausted or the iterator is closed/garbage collected, so avoid leaving it
+        partially consumed for long.
+
+        :param query: MongoDB query filter
+        :return: iterator of matching instances
+        """
+        return (
+            cls._get(doc)
+            for doc in cls.get_collection().find(query, projection=cls._PROJECTION, batch_size=cls._BATCH_SIZE)
+        )
+
+    @classmethod
+    def iter_find(cls, *args, **kwargs) -> collections.abc.Iterator[Self]:
+        """Lazily iterate over instances whose fields match the given values.  See iter_query for cursor behaviour"""
+        all_args = cls._get_all_args(*args, **kwargs)
+        return cls.iter_query(cls._get_store_vals(all_args))
+
     @classmethod
     def query(cls, query) -> list[Self]:
-        return [cls._get(doc) for doc in cls.get_collection().find(query)]
+        return list(cls.iter_query(query))
 
     @classmethod
     def find(cls, *args, **kwargs) -> list[Self]:
-        all_args = cls._get_all_args(*args, **kwargs)
-        return [cls._get(doc) for doc in cls.get_collection().find(cls._get_store_vals(all_args))]
+        return list(cls.iter_find(*args, **kwargs))
 
     @classmethod
     def find_one(cls, *args, **kwargs) -> Optional[Self]:
         all_args = cls._get_all_args(*args, **kwargs)
-        if doc := cls.get_collection().find_one(cls._get_store_vals(all_args)):
+        if doc := cls.get_collection().find_one(cls._get_store_vals(all_args), projection=cls._PROJECTION):
             return cls._get(doc)
 
     @classmethod
@@ -235,7 +419,8 @@ class MongoDbModel(DbModel):
     @classmethod
     def new(cls, *args, **kwargs):
         all_args = cls._get_all_args(*args, **kwargs)
-        doc = {k: all_args[k] if k in all_args else cls._get_default(k) for k in cls.__annotations__}
+        defaults = cls._DEFAULT_FACTORIES
+        doc = {k: all_args[k] if k in all_args else defaults[k]() for k in cls._ANNO_KEYS}
         try:
             insert_result = cls.get_collection().insert_one(cls._get_store_vals(doc))
         except pymongo.errors.DuplicateKeyError as e:
@@ -244,31 +429,115 @@ class MongoDbModel(DbModel):
         return cls(**doc, ___internal___=True)
 
     @classmethod
-    def get_or_create(cls, *args, **kwargs):
-        return cls.find_one(*args, **kwargs) or cls(*args, **kwargs)
+    def bulk_new(cls, rows: collections.abc.Iterable[dict], batch_size: int = 1000) -> list[Self]:
+        """Create many new instances at once, writing them to the database with insert_many in batches of
+        batch_size documents rather than with one insert_one round trip per instance.
+
+        Writes are not all-or-nothing: if a batch fails (e.g. with UniqueConflict), the documents of earlier batches,
+        and those of the failing batch that did not error (as batches are unordered), have already been written.
+        The raised UniqueConflict (or BulkWriteFailed for other write errors) has an `inserted` attribute listing the
+        instances for those written documents, in the same order as rows; later batches are not attempted.
+
+        :param rows: iterable of dicts of field values, one per new instance
+        :param batch_size: max number of documents sent in a single insert_many call
+        :return: list of the new instances, in the same order as rows
+        """
+        _check_batch_size(batch_size)
+        defaults = cls._DEFAULT_FACTORIES
+        docs = [{k: row[k] if k in row else defaults[k]() for k in cls._ANNO_KEYS} for row in rows]
+        collection = cls.get_collection()
+        for i in range(0, len(docs), batch_size):
+            batch = docs[i:i + batch_size]
+            # assign ids up front so the documents written before a failure can be identified
+            for doc in batch:
+                doc['_id'] = bson.ObjectId()
+            try:
+                collection.insert_many([cls._get_store_vals(doc) for doc in batch], ordered=False)
+            except pymongo.errors.BulkWriteError as e:
+                failed = {error['index'] for error in _write_errors(e)}
+                inserted = docs[:i] + [doc for j, doc in enumerate(batch) if j not in failed]
+                _raise_bulk_write_error(e, inserted=[cls(**doc, ___internal___=True) for doc in inserted])
+        return [cls(**doc, ___internal___=True) for doc in docs]
 
     @classmethod
-    def _get_store_vals(cls, d: dict) -> dict:
-        """Convert values in param d to database-storable values using cls._SERIALIZER
+    def bulk_update(cls, instances: collections.abc.Iterable[Self], batch_size: int = 1000):
+        """Write the pending changes of many instances at once, i.e. fields assigned directly since the instance was
+        last written (e.g. my_inst.field1 = 'changed'), using bulk_write in batches of batch_size operations rather
+        than one update_one round trip per instance.  Instances without pending changes are skipped.
+
+        :param instances: iterable of instances of this model (not of other models, including subclasses, which
+            are stored in their own collections)
+        :param batch_size: max number of update operations sent in a single bulk_write call
+        """
+        _check_batch_size(batch_size)
+        instances = list(instances)
+        for inst in instances:
+            if type(inst) is not cls:
+                raise TypeError(f'{cls.__name__}.bulk_update can only write {cls.__name__} instances, not {inst!r}')
+        instances = [inst for inst in instances if inst._pending_updates]
+        collection = cls.get_collection()
+        for i in range(0, len(instances), batch_size):
+            batch = instances[i:i + batch_size]
+            operations = [
+                pymongo.operations.UpdateOne(inst._id_filter, {'$set': cls._get_store_vals(inst._pending_updates)})
+                for inst in batch
+            ]
+            try:
+                collection.bulk_write(operations, ordered=False)
+            except pymongo.errors.BulkWriteError as e:
+                # with ordered=False the other operations were still applied, so they are no longer pending
+                failed = {error['index'] for error in _write_errors(e)}
+                for j, inst in enumerate(batch):
+                    if j not in failed:
+                        object.__setattr__(inst, '_pending_updates', None)
+                _raise_bulk_write_error(e)
+            for inst in batch:
+                object.__setattr__(inst, '_pending_updates', None)
 
-        :param d: dict containing raw values
-        :return: dict containing database-storable values
+    @classmethod
+    def get_or_create(cls, *args, **kwargs):
+        """Get the document matching the given field values, or insert a new one with those values (and defaults for
+        any other fields) if there is none, as a single atomic upsert.  If any of the other fields has a callable or
+        iterator default, this falls back to find_one then new, so the default is only made when actually inserting.
         """
-        return {k: cls._SERIALIZER.serialize(v) for k, v in d.items()}
+        all_args = cls._get_all_args(*args, **kwargs)
+        missing = [k for k in cls._ANNO_KEYS if k not in all_args]
+        if cls._STATEFUL_DEFAULTS.intersection(missing):
+            return cls.find_one(*args, **kwargs) or cls.new(*args, **kwargs)
+        defaults = cls._DEFAULT_FACTORIES
+        # the upsert copies the filter's field values into the new document, so only other fields are set on insert.
+        # A new _id is generated unless the filter has one (it must not be set to a different value on insert)
+        on_insert = {} if '_id' in all_args else {'_id': bson.ObjectId()}
+        on_insert.update((k, defaults[k]()) for k in missing)
+        if not on_insert:
+            # $setOnInsert can't be empty, so repeat the filter's own _id, which leaves it unchanged
+            on_insert['_id'] = all_args['_id']
+        try:
+            doc = cls.get_collection().find_one_and_update(
+                cls._get_store_vals(all_args),
+                {'$setOnInsert': cls._get_store_vals(on_insert)},
+                projection=cls._PROJECTION,
+                upsert=True,
+                return_document=pymongo.collection.ReturnDocument.AFTER,
+            )
+        except pymongo.errors.DuplicateKeyError as e:
+            raise UniqueConflict from e
+        return cls._get(doc)
 
     @classmethod
-    def _get_retrieve_vals(cls, d: dict) -> dict:
-        """Convert values in param d from database-storable values back to their original values using cls._SERIALIZER
-        :param d: dict containing database-storable values
-        :return: dict containing raw values
+    def _get_store_vals(cls, d: dict) -> dict:
+        """Convert values in param d to database-storable values using cls._SERIALIZER.  If every value is already
+        storable as is (e.g. simple queries on str, int or ObjectId fields), the serializer is skipped and a plain
+        copy of d is returned.  The result is always a new dict, so pymongo adding '_id' to it never changes d
+
+        :param d: dict containing raw values
+        :return: new dict containing database-storable values
         """
-        rv = {}
-        for k, v in d.items():
-            if k in cls.__annotations__:
-                rv[k] = cls._SERIALIZER.deserialize(cls.__annotations__[k], v)
-            else:
-                rv[k] = v
-        return rv
+        passthrough_types = cls._SERIALIZER._PASSTHROUGH_TYPES
+        if all(type(v) in passthrough_types for v in d.values()):
+            return d.copy()
+        serialize = cls._SERIALIZE
+        return {k: serialize(v) for k, v in d.items()}
 
     def update(self, **kwargs):
         """Update in-memory model instance with values in kwargs, and also write ONLY those changes to the database
@@ -280,18 +549,21 @@ class MongoDbModel(DbModel):
         my_inst.field1 = 'not changed'
         my_inst.save(field2='changed too')  # Writes BOTH field1 and field2 change to the database
         """
-        updates = {k: v for k, v in kwargs.items() if k in self.__annotations__}
+        updates = {k: v for k, v in kwargs.items() if k in self._ANNO_SET}
         if updates:
-            self.__dict__.update(updates)
+            for k, v in updates.items():
+                object.__setattr__(self, k, v)
             try:
-                self.get_collection().update_one({'_id': self._id},
-                                                 {'$set': self.__class__._get_store_vals(updates)})
+                self.get_collection().update_one(self._id_filter, {'$set': self.__class__._get_store_vals(updates)})
             except pymongo.errors.DuplicateKeyError as e:
                 raise UniqueConflict from e
+            if pending_updates := self._pending_updates:
+                for k in updates:
+                    pending_updates.pop(k, None)
 
     def delete(self):
-        self.get_collection().delete_one({'_id': self._id})
-        self._WEAKREFS.pop(self._id)
+        self.get_collection().delete_one(self._id_filter)
+        self._WEAKREFS.pop(self._id, None)
 
     def _db_store_(self):
         return getattr(self, self.__class__._KEY_FIELD)
@@ -28,16 +28,21 @@ def dec_to_str(dec: decimal.Decimal, min_dp: int = 0) -> str:
 
 
 class Serializer:
-    def __init__(self):
+    def __init__(self, passthrough_types: collections.abc.Iterable[type] = ()):
         self._DATA_CAST: dict[type, tuple[collections.abc.Callable, collections.abc.Callable]] = {
             datetime.date: (datetime.date.isoformat, datetime.date.fromisoformat),
             datetime.time: (datetime.time.isoformat, datetime.time.fromisoformat),
             datetime.datetime: (datetime.datetime.isoformat, datetime.datetime.fromisoformat),
             decimal.Decimal: (dec_to_str, decimal.Decimal),
         }
+        # types that serialize returns unchanged, so callers can skip serializing values of exactly these types
+        self._PASSTHROUGH_TYPES: frozenset[type] = frozenset(
+            {str, int, float, bool, bytes, type(None), *passthrough_types}
+        ) - self._DATA_CAST.keys()
 
     def register_type(self, type_, store_fn: collections.abc.Callable, retrive_fn: collections.abc.Callable):
         self._DATA_CAST[type_] = (store_fn, retrive_fn)
+        self._PASSTHROUGH_TYPES = self._PASSTHROUGH_TYPES - {type_}
 
     def serialize(self, v):
         if v is None:
@@ -1,6 +1,10 @@
 import datetime
+import inspect
+import itertools
 import unittest
+import unittest.mock
 
+import bson
 import pymongo
 
 import nativedb.mongodb
@@ -9,6 +13,7 @@ import nativedb.mongodb
 class TestMongoDb(unittest.TestCase):
     def tearDown(self) -> None:
         pymongo.MongoClient().drop_database('NativeDbTest')
+        pymongo.MongoClient().drop_database('NativeDbTestOther')
 
     def test_001_new(self):
         @nativedb.database('NativeDbTest')
@@ -138,6 +143,319 @@ class TestMongoDb(unittest.TestCase):
         new_employee.update(employee_id='DifferentEmployeeId')
         new_employee.delete()
 
+    def test_003_bulk_new(self):
+        @nativedb.database('NativeDbTest')
+        class Employee(nativedb.mongodb.MongoDbModel):
+            employee_id: nativedb.Unique[str]
+            name: str
+            dob: datetime.date
+
+        employees = Employee.bulk_new([
+            {'employee_id': f'EmployeeId{i}', 'name': f'Employee {i}', 'dob': datetime.date(2000, 1, i + 1)}
+            for i in range(5)
+        ], batch_size=2)
+        self.assertEqual(5, len(employees))
+        self.assertEqual(5, len(Employee.all()))
+        self.assertEqual(['EmployeeId0', 'EmployeeId1', 'EmployeeId2', 'EmployeeId3', 'EmployeeId4'],
+                         [employee.employee_id for employee in employees])
+        retrieved_employee = Employee.find_one(employee_id='EmployeeId3')
+        self.assertIs(employees[3], retrieved_employee)
+        self.assertEqual(datetime.date(2000, 1, 4), retrieved_employee.dob)
+
+        # documents that didn't conflict are still written, and reported on the exception
+        with self.assertRaises(nativedb.exceptions.UniqueConflict) as cm:
+            Employee.bulk_new([
+                {'employee_id': 'EmployeeId5', 'name': 'Employee 5'},
+                {'employee_id': 'EmployeeId0', 'name': 'Duplicate'},
+                {'employee_id': 'EmployeeId6', 'name': 'Employee 6'},
+            ])
+        self.assertEqual(['EmployeeId5', 'EmployeeId6'], [employee.employee_id for employee in cm.exception.inserted])
+        self.assertIs(cm.exception.inserted[1], Employee.find_one(employee_id='EmployeeId6'))
+        self.assertEqual(7, len(Employee.all()))
+
+        self.assertRaises(ValueError, Employee.bulk_new, [{'employee_id': 'EmployeeId7'}], batch_size=0)
+
+    def test_004_bulk_update(self):
+        @nativedb.database('NativeDbTest')
+        class Employee(nativedb.mongodb.MongoDbModel):
+            employee_id: nativedb.Unique[str]
+            name: str
+            dob: datetime.date
+
+        employees = Employee.bulk_new([
+            {'employee_id': f'EmployeeId{i}', 'name': f'Employee {i}'} for i in range(3)
+        ])
+        for employee in employees:
+            employee.dob = datetime.date(2000, 1, 1)
+        employees[0].name = 'Deux Glaces'
+        Employee.bulk_update(employees)
+        del employees
+        retrieved_employees = Employee.all()
+        # instances only get a pending updates dict once a field is assigned
+        self.assertEqual([None] * 3, [employee._pending_updates for employee in retrieved_employees])
+        self.assertEqual([datetime.date(2000, 1, 1)] * 3, [employee.dob for employee in retrieved_employees])
+        self.assertEqual('Deux Glaces', Employee.find_one(employee_id='EmployeeId0').name)
+
+        # a unique field conflicting with another document raises, while the other changes are still written
+        retrieved_employees[1].employee_id = 'EmployeeId0'
+        retrieved_employees[2].name = 'Pi Thagoras'
+        self.assertRaises(
+            nativedb.exceptions.UniqueConflict,
+            Employee.bulk_update,
+            retrieved_employees,
+        )
+        self.assertEqual('Pi Thagoras', Employee.find_one(employee_id='EmployeeId2').name)
+
+        # instances of other models are rejected rather than written to this model's collection
+        @nativedb.database('NativeDbTest')
+        class Department(nativedb.mongodb.MongoDbModel):
+            department_code: nativedb.Unique[str]
+            name: str
+
+        department = Department(department_code='Weirdoes', name='Pythonistas!')
+        department.name = 'Snakes'
+        self.assertRaises(TypeError, Employee.bulk_update, [department])
+        Department.bulk_update([department])
+        del department
+        self.assertEqual('Snakes', Department.find_one(department_code='Weirdoes').name)
+
+    def test_005_iter_find(self):
+        @nativedb.database('NativeDbTest')
+        class Employee(nativedb.mongodb.MongoDbModel):
+            employee_id: nativedb.Unique[str]
+            name: str
+            dob: datetime.date
+
+        employees = Employee.bulk_new([
+            {'employee_id': f'EmployeeId{i}', 'name': 'Deux Glaces' if i % 2 else 'Pi Thagoras'} for i in range(4)
+        ])
+        iterator = Employee.iter_find(name='Deux Glaces')
+        self.assertNotIsInstance(iterator, list)
+        self.assertEqual([employees[1], employees[3]], list(iterator))
+        self.assertEqual(Employee.find(name='Pi Thagoras'), list(Employee.iter_query({'name': 'Pi Thagoras'})))
+
+    def test_006_set_database_and_collection(self):
+        @nativedb.database('NativeDbTest')
+        class Employee(nativedb.mongodb.MongoDbModel):
+            employee_id: nativedb.Unique[str]
+            name: str
+
+        Employee(employee_id='NewEmployeeId', name='Deux Glaces')
+        self.assertEqual('NativeDbTest', Employee.get_collection().database.name)
+
+        # switching database after the collection has been used switches the collection too
+        Employee.set_database('NativeDbTestOther')
+        self.assertEqual('NativeDbTestOther', Employee.get_collection().database.name)
+        self.assertEqual('Employee', Employee.get_collection().name)
+        self.assertEqual(0, len(Employee.all()))
+        Employee(employee_id='NewEmployeeId', name='Pi Thagoras')
+        self.assertEqual(1, len(Employee.all()))
+
+        # an explicitly set collection is used, and kept when the database changes
+        explicit_collection = pymongo.MongoClient().get_database('NativeDbTest').get_collection('Staff')
+        Employee.set_collection(explicit_collection)
+        self.assertIs(explicit_collection, Employee.get_collection())
+        Employee.set_database('NativeDbTestOther')
+        self.assertIs(explicit_collection, Employee.get_collection())
+        self.assertEqual(0, len(Employee.all()))
+        Employee(employee_id='NewEmployeeId', name='Old Timer')
+        self.assertEqual(1, explicit_collection.count_documents({}))
+        # unique indexes are created on the explicitly set collection too
+        self.assertRaises(
+            nativedb.exceptions.UniqueConflict,
+            Employee.new,
+            employee_id='NewEmployeeId',
+        )
+
+        # a collection set by name follows a later change of database, as with stacked decorators
+        default_database = nativedb.mongodb.MongoDbModel._DEFAULT_DATABASE
+        self.addCleanup(setattr, nativedb.mongodb.MongoDbModel, '_DEFAULT_DATABASE', default_database)
+        nativedb.mongodb_config(database='NativeDbTest')
+
+        @nativedb.database('NativeDbTestOther')
+        @nativedb.collection('Staff')
+        class Manager(nativedb.mongodb.MongoDbModel):
+            manager_id: nativedb.Unique[str]
+
+        self.assertEqual('NativeDbTestOther', Manager.get_database().name)
+        self.assertEqual('NativeDbTestOther', Manager.get_collection().database.name)
+        self.assertEqual('Staff', Manager.get_collection().name)
+
+    def test_007_get_or_create(self):
+        @nativedb.database('NativeDbTest')
+        class Employee(nativedb.mongodb.MongoDbModel):
+            employee_id: nativedb.Unique[str]
+            name: str = 'Anonymous'
+            skills: list[str]
+
+        # miss inserts a new document, with defaults for the other fields
+        created_employee = Employee.get_or_create(employee_id='NewEmployeeId')
+        self.assertEqual('NewEmployeeId', created_employee.employee_id)
+        self.assertEqual('Anonymous', created_employee.name)
+        self.assertEqual([], created_employee.skills)
+        self.assertIs(created_employee, Employee.find_one(employee_id='NewEmployeeId'))
+        self.assertEqual(1, len(Employee.all()))
+
+        # hit returns the existing document without inserting
+        created_employee.update(name='Deux Glaces')
+        self.assertIs(created_employee, Employee.get_or_create(employee_id='NewEmployeeId'))
+        self.assertEqual('Deux Glaces', created_employee.name)
+        self.assertEqual(1, len(Employee.all()))
+
+        # no document matches, but inserting one would conflict with an existing unique value
+        self.assertRaises(
+            nativedb.exceptions.UniqueConflict,
+            Employee.get_or_create,
+            employee_id='NewEmployeeId',
+            name='Pi Thagoras',
+        )
+
+        # filtering on _id inserts the document with that _id on a miss
+        new_id = bson.ObjectId()
+        employee_by_id = Employee.get_or_create(_id=new_id, employee_id='IdEmployeeId')
+        self.assertEqual(new_id, employee_by_id._id)
+        self.assertIs(employee_by_id, Employee.get_or_create(_id=new_id))
+        self.assertIs(employee_by_id, Employee.find_one(employee_id='IdEmployeeId'))
+
+    def test_008_get_or_create_stateful_default(self):
+        @nativedb.database('NativeDbTest')
+        class Employee(nativedb.mongodb.MongoDbModel):
+            employee_id: nativedb.Unique[str]
+            payroll_number: int = itertools.count(1)
+
+        first_employee = Employee.get_or_create(employee_id='FirstEmployeeId')
+        for _ in range(3):
+            self.assertIs(first_employee, Employee.get_or_create(employee_id='FirstEmployeeId'))
+        # iterator defaults are only advanced when a document is actually inserted
+        self.assertEqual(1, first_employee.payroll_number)
+        self.assertEqual(2, Employee.get_or_create(employee_id='SecondEmployeeId').payroll_number)
+
+    def test_009_defaults(self):
+        @nativedb.database('NativeDbTest')
+        class Employee(nativedb.mongodb.MongoDbModel):
+            employee_id: nativedb.Unique[str]
+            name: str = 'Anonymous'
+            joined: datetime.date = datetime.date.today
+            payroll_number: int = itertools.count(100)
+            skills: list
+
+        first_employee = Employee.new(employee_id='FirstEmployeeId')
+        second_employee = Employee.new(employee_id='SecondEmployeeId', name='Deux Glaces')
+
+        # scalar default
+        self.assertEqual('Anonymous', first_employee.name)
+        self.assertEqual('Deux Glaces', second_employee.name)
+        # callable default is called
+        self.assertEqual(datetime.date.today(), first_employee.joined)
+        # iterator default gives a new value for each new instance
+        self.assertEqual(100, first_employee.payroll_number)
+        self.assertEqual(101, second_employee.payroll_number)
+        # container defaults are new for each instance, never shared
+        self.assertEqual([], first_employee.skills)
+        self.assertIsNot(first_employee.skills, second_employee.skills)
+        first_employee.update(skills=['Python'])
+        self.assertEqual([], second_employee.skills)
+
+        del first_employee, second_employee
+        retrieved_employee = Employee.find_one(employee_id='FirstEmployeeId')
+        self.assertEqual('Anonymous', retrieved_employee.name)
+        self.assertEqual(datetime.date.today(), retrieved_employee.joined)
+        self.assertEqual(100, retrieved_employee.payroll_number)
+        self.assertEqual(['Python'], retrieved_employee.skills)
+
+        # a document missing a field gets the class default for it when retrieved.  Callable and iterator defaults
+        # are only made for new documents, so those fields are None, and container fields get a new empty container
+        Employee.get_collection().insert_one({'employee_id': 'RawEmployeeId'})
+        raw_employee = Employee.find_one(employee_id='RawEmployeeId')
+        self.assertEqual('Anonymous', raw_employee.name)
+        self.assertIsNone(raw_employee.joined)
+        self.assertIsNone(raw_employee.payroll_number)
+        self.assertEqual([], raw_employee.skills)
+
+    def test_010_get_store_vals(self):
+        @nativedb.database('NativeDbTest')
+        class Employee(nativedb.mongodb.MongoDbModel):
+            employee_id: nativedb.Unique[str]
+            name: str
+            dob: datetime.date
+
+        # values that are already storable skip the serializer, but a new dict is still returned
+        simple_vals = {'_id': bson.ObjectId(), 'employee_id': 'NewEmployeeId', 'name': None}
+        with unittest.mock.patch.object(Employee, '_SERIALIZE') as serialize:
+            store_vals = Employee._get_store_vals(simple_vals)
+        serialize.assert_not_called()
+        self.assertEqual(simple_vals, store_vals)
+        self.assertIsNot(simple_vals, store_vals)
+
+        # any value that isn't storable as is means every value goes through the serializer
+        mixed_vals = {'employee_id': 'NewEmployeeId', 'dob': datetime.date(1999, 12, 31)}
+        self.assertEqual({'employee_id': 'NewEmployeeId', 'dob': '1999-12-31'}, Employee._get_store_vals(mixed_vals))
+        self.assertEqual(datetime.date(1999, 12, 31), mixed_vals['dob'])
+
+    def test_011_signature(self):
+        @nativedb.database('NativeDbTest')
+        class Employee(nativedb.mongodb.MongoDbModel):
+            employee_id: nativedb.Unique[str]
+            name: str
+            dob: datetime.date
+
+        @nativedb.database('NativeDbTest')
+        class Department(nativedb.mongodb.MongoDbModel):
+            department_code: nativedb.Unique[str]
+            employees: list[Employee]
+
+        # each model reports its own fields, not those of the most recently defined model
+        employee_params = inspect.signature(Employee).parameters
+        self.assertEqual(['employee_id', 'name', 'dob'], list(employee_params))
+        self.assertEqual(datetime.date, employee_params['dob'].annotation)
+        self.assertEqual(['department_code', 'employees'], list(inspect.signature(Department).parameters))
+
+    def test_012_slots(self):
+        @nativedb.database('NativeDbTest')
+        class Employee(nativedb.mongodb.MongoDbModel):
+            employee_id: nativedb.Unique[str]
+            name: str = 'Anonymous'
+
+        employee = Employee(employee_id='NewEmployeeId')
+        # class body defaults still apply, though fields are stored in slots rather than an instance __dict__
+        self.assertEqual('Anonymous', employee.name)
+        self.assertEqual({'name': 'Anonymous'}, Employee._FIELD_DEFAULTS)
+        self.assertFalse(hasattr(employee, '__dict__'))
+        self.assertRaises(AttributeError, setattr, employee, 'nickname', 'Deux')
+
+        # a model can declare its own extra slots, and still gets slots and defaults for its fields
+        @nativedb.database('NativeDbTest')
+        class Department(nativedb.mongodb.MongoDbModel):
+            __slots__ = ('headcount_cache',)
+            department_code: nativedb.Unique[str]
+            name: str = 'Unnamed'
+
+        department = Department(department_code='Weirdoes')
+        self.assertEqual('Unnamed', department.name)
+        department.headcount_cache = 3
+        self.assertEqual(3, department.headcount_cache)
+        self.assertFalse(hasattr(department, '__dict__'))
+        del department
+        self.assertEqual('Unnamed', Department.find_one(department_code='Weirdoes').name)
+
+    def test_013_extra_document_fields(self):
+        @nativedb.database('NativeDbTest')
+        class Employee(nativedb.mongodb.MongoDbModel):
+            employee_id: nativedb.Unique[str]
+            name: str
+
+        # documents written by something else may hold fields the model doesn't know about
+        Employee.get_collection().insert_one({'employee_id': 'RawEmployeeId', 'name': 'Deux Glaces', 'salary': 100})
+        retrieved_employee = Employee.find_one(employee_id='RawEmployeeId')
+        self.assertEqual('Deux Glaces', retrieved_employee.name)
+        self.assertFalse(hasattr(retrieved_employee, 'salary'))
+        self.assertEqual([retrieved_employee], Employee.find(name='Deux Glaces'))
+        self.assertIs(retrieved_employee, Employee.get_or_create(employee_id='RawEmployeeId'))
+        del retrieved_employee
+        self.assertEqual('Deux Glaces', Employee.get_or_create(employee_id='RawEmployeeId').name)
+        # the extra field is left untouched in the database
+        self.assertEqual(100, Employee.get_collection().find_one({'employee_id': 'RawEmployeeId'})['salary'])
+
     def test_901_test_config(self):
         nativedb.mongodb_config(database='NativeDbTest')
 
@@ -9,3 +9,12 @@ class TestSerializer(unittest.TestCase):
         serializer = Serializer()
         self.assertEqual('2021-12-25', serializer.serialize(datetime.date(2021, 12, 25)))
         self.assertEqual(datetime.date(2021, 12, 25), serializer.deserialize(datetime.date, '2021-12-25'))
+
+    def test_passthrough_types(self):
+        serializer = Serializer()
+        self.assertIn(str, serializer._PASSTHROUGH_TYPES)
+        self.assertNotIn(datetime.date, serializer._PASSTHROUGH_TYPES)
+        # registering a cast for a type means its values are no longer passed through unchanged
+        serializer.register_type(str, str.upper, str.lower)
+        self.assertNotIn(str, serializer._PASSTHROUGH_TYPES)
+        self.assertEqual('ABC', serializer.serialize('abc'))